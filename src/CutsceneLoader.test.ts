@@ -0,0 +1,127 @@
+/**
+ * CutsceneLoader tests - loads cutscenes through a stubbed fetch.
+ *
+ * Covers how load() reports completion and errors when the CMD and POL
+ * files arrive and are parsed independently, and reuse of cached cutscenes.
+ */
+
+import { describe, it, expect, vi, afterEach } from 'vitest'
+import { CutsceneLoader } from './CutsceneLoader'
+
+/** Minimal CMD file: one implicit subscene with no commands */
+const VALID_CMD = new Uint8Array([0, 0, 0x80]).buffer
+
+/** Minimal POL file: no shapes, one black palette */
+const VALID_POL = new Uint8Array(0x20).buffer
+
+/** Too short to parse as either file type */
+const INVALID = new Uint8Array(1).buffer
+
+/**
+ * Stub fetch to serve files by extension ('.CMD' / '.POL').
+ * Extensions without a body answer with a 404.
+ */
+function stubFetch(files: Record<string, ArrayBuffer>) {
+  const fetchMock = vi.fn(async (url: string) => {
+    const body = files[url.slice(url.lastIndexOf('.'))]
+    return {
+      ok: body !== undefined,
+      status: body !== undefined ? 200 : 404,
+      statusText: body !== undefined ? 'OK' : 'Not Found',
+      arrayBuffer: async () => body,
+    } as unknown as Response
+  })
+  vi.stubGlobal('fetch', fetchMock)
+  return fetchMock
+}
+
+/** Let all pending fetch/parse continuations run */
+function settle(): Promise<void> {
+  return new Promise(resolve => setTimeout(resolve, 0))
+}
+
+afterEach(() => {
+  vi.unstubAllGlobals()
+})
+
+describe('CutsceneLoader errors', () => {
+  it('reports a single error when both files fail to parse', async () => {
+    stubFetch({ '.CMD': INVALID, '.POL': INVALID })
+    const onLoad = vi.fn()
+    const onError = vi.fn()
+
+    new CutsceneLoader().load('TEST', onLoad, undefined, onError)
+    await settle()
+
+    expect(onError).toHaveBeenCalledTimes(1)
+    expect(onLoad).not.toHaveBeenCalled()
+  })
+
+  it('reports a single error and never loads when a file is missing', async () => {
+    stubFetch({ '.CMD': VALID_CMD })
+    const onLoad = vi.fn()
+    const onError = vi.fn()
+
+    new CutsceneLoader().load('TEST', onLoad, undefined, onError)
+    await settle()
+
+    expect(onError).toHaveBeenCalledTimes(1)
+    expect((onError.mock.calls[0][0] as Error).message).toBe('HTTP 404: Not Found')
+    expect(onLoad).not.toHaveBeenCalled()
+  })
+
+  it('routes an exception thrown by onLoad to onError once', async () => {
+    stubFetch({ '.CMD': VALID_CMD, '.POL': VALID_POL })
+    const failure = new Error('onLoad failed')
+    const onLoad = vi.fn(() => { throw failure })
+    const onError = vi.fn()
+
+    new CutsceneLoader().load('TEST', onLoad, undefined, onError)
+    await settle()
+
+    expect(onLoad).toHaveBeenCalledTimes(1)
+    expect(onError).toHaveBeenCalledTimes(1)
+    expect(onError).toHaveBeenCalledWith(failure)
+  })
+})
+
+describe('CutsceneLoader cache', () => {
+  it('reuses a parsed cutscene without fetching again', async () => {
+    const fetchMock = stubFetch({ '.CMD': VALID_CMD, '.POL': VALID_POL })
+    const loader = new CutsceneLoader()
+
+    const first = await loader.loadAsync('TEST')
+    const progress: number[] = []
+    const second = await loader.loadAsync('test', event => progress.push(event.loaded))
+
+    expect(second).toBe(first)
+    expect(fetchMock).toHaveBeenCalledTimes(2)
+    expect(progress).toStrictEqual([2])
+  })
+
+  it('fetches again after clearCache()', async () => {
+    const fetchMock = stubFetch({ '.CMD': VALID_CMD, '.POL': VALID_POL })
+    const loader = new CutsceneLoader()
+
+    const first = await loader.loadAsync('TEST')
+    loader.clearCache()
+    const second = await loader.loadAsync('TEST')
+
+    expect(second).not.toBe(first)
+    expect(fetchMock).toHaveBeenCalledTimes(4)
+  })
+
+  it('routes an exception thrown by onLoad on a cache hit to onError', async () => {
+    stubFetch({ '.CMD': VALID_CMD, '.POL': VALID_POL })
+    const loader = new CutsceneLoader()
+    await loader.loadAsync('TEST')
+
+    const failure = new Error('onLoad failed')
+    const onError = vi.fn()
+    loader.load('TEST', () => { throw failure }, undefined, onError)
+    await settle()
+
+    expect(onError).toHaveBeenCalledTimes(1)
+    expect(onError).toHaveBeenCalledWith(failure)
+  })
+})
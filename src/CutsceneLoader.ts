@@ -4,11 +4,18 @@
  * Loads CMD and POL binary files and returns a Cutscene object.
  */
 
-import type { Cutscene } from './types'
+import type { Cutscene, Script, Shape, Color } from './types'
 import { parseCMD, parsePOL } from './CutsceneParser'
 
+/**
+ * Parsed cutscenes are kept for the lifetime of the loader, so loading the
+ * same name again resolves without refetching or reparsing. Use
+ * clearCache() to release them.
+ */
 export class CutsceneLoader {
   private basePath: string = ''
+  /** Parsed cutscenes keyed by base path + name */
+  private cache = new Map<string, Cutscene>()
 
   /**
    * Set the base path for loading cutscene files.
@@ -19,6 +26,13 @@ export class CutsceneLoader {
     return this
   }
 
+  /**
+   * Drop all cached cutscenes.
+   */
+  clearCache(): void {
+    this.cache.clear()
+  }
+
   /**
    * Load a cutscene by name.
    * 
@@ -36,23 +50,57 @@ export class CutsceneLoader {
     const upperName = name.toUpperCase()
     const cmdUrl = this.basePath + upperName + '.CMD'
     const polUrl = this.basePath + upperName + '.POL'
+    const cacheKey = this.basePath + upperName
 
-    // Track loading progress
-    let cmdBuffer: ArrayBuffer | null = null
-    let polBuffer: ArrayBuffer | null = null
+    // Track loading progress. Each file is parsed as soon as it arrives so
+    // parsing one overlaps with the network fetch of the other.
+    let script: Script | null = null
+    let pol: { shapes: Shape[], palettes: Color[][] } | null = null
     let loadedCount = 0
+    // Set on the first error so onError is reported at most once
+    let failed = false
+
+    const reportError = (e: unknown, message: string) => {
+      if (failed) {
+        return
+      }
+      failed = true
+      if (onError) {
+        onError(e)
+      } else {
+        console.error(message, e)
+      }
+    }
+
+    // Reuse a previously parsed cutscene (still reported asynchronously,
+    // with a single completed progress event)
+    const cached = this.cache.get(cacheKey)
+    if (cached) {
+      queueMicrotask(() => {
+        if (onProgress) {
+          onProgress(new ProgressEvent('progress', {
+            loaded: 2,
+            total: 2,
+            lengthComputable: true
+          }))
+        }
+        try {
+          onLoad(cached)
+        } catch (e) {
+          reportError(e, 'CutsceneLoader: Failed to parse cutscene:')
+        }
+      })
+      return
+    }
 
     const checkComplete = () => {
-      if (cmdBuffer && polBuffer) {
+      if (script && pol && !failed) {
         try {
-          const cutscene = this.parse(cmdBuffer, polBuffer, upperName)
+          const cutscene = this.assemble(script, pol, upperName)
+          this.cache.set(cacheKey, cutscene)
           onLoad(cutscene)
         } catch (e) {
-          if (onError) {
-            onError(e)
-          } else {
-            console.error('CutsceneLoader: Failed to parse cutscene:', e)
-          }
+          reportError(e, 'CutsceneLoader: Failed to parse cutscene:')
         }
       }
     }
@@ -79,16 +127,17 @@ export class CutsceneLoader {
         return response.arrayBuffer()
       })
       .then(buffer => {
-        cmdBuffer = buffer
         onFileLoaded()
+        try {
+          script = parseCMD(buffer)
+        } catch (e) {
+          reportError(e, 'CutsceneLoader: Failed to parse cutscene:')
+          return
+        }
         checkComplete()
       })
       .catch(e => {
-        if (onError) {
-          onError(e)
-        } else {
-          console.error(`CutsceneLoader: Failed to load ${cmdUrl}:`, e)
-        }
+        reportError(e, `CutsceneLoader: Failed to load ${cmdUrl}:`)
       })
 
     // Load POL file
@@ -100,16 +149,17 @@ export class CutsceneLoader {
         return response.arrayBuffer()
       })
       .then(buffer => {
-        polBuffer = buffer
         onFileLoaded()
+        try {
+          pol = parsePOL(buffer)
+        } catch (e) {
+          reportError(e, 'CutsceneLoader: Failed to parse cutscene:')
+          return
+        }
         checkComplete()
       })
       .catch(e => {
-        if (onError) {
-          onError(e)
-        } else {
-          console.error(`CutsceneLoader: Failed to load ${polUrl}:`, e)
-        }
+        reportError(e, `CutsceneLoader: Failed to load ${polUrl}:`)
       })
   }
 
@@ -134,13 +184,21 @@ export class CutsceneLoader {
    * @returns Parsed Cutscene object
    */
   parse(cmdBuffer: ArrayBuffer, polBuffer: ArrayBuffer, name: string): Cutscene {
-    const script = parseCMD(cmdBuffer)
-    const { shapes, palettes } = parsePOL(polBuffer)
+    return this.assemble(parseCMD(cmdBuffer), parsePOL(polBuffer), name)
+  }
 
+  /**
+   * Combine parsed CMD and POL results into a Cutscene object.
+   */
+  private assemble(
+    script: Script,
+    pol: { shapes: Shape[], palettes: Color[][] },
+    name: string
+  ): Cutscene {
     return {
       name,
-      shapes,
-      palettes,
+      shapes: pol.shapes,
+      palettes: pol.palettes,
       script
     }
   }
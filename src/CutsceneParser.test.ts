@@ -0,0 +1,136 @@
+/**
+ * CutsceneParser tests - parses small hand-built CMD/POL buffers.
+ *
+ * These run without game data, so they exercise the binary decoding paths
+ * that the frame comparison tests only reach when DATA/ is populated.
+ */
+
+import { describe, it, expect } from 'vitest'
+import { parseCMD, parsePOL } from './CutsceneParser'
+
+/** Big-endian 16-bit word as two bytes */
+function be16(value: number): number[] {
+  return [(value >> 8) & 0xFF, value & 0xFF]
+}
+
+/** Build a CMD file with a single implicit subscene */
+function buildCMD(commands: number[]): ArrayBuffer {
+  return new Uint8Array([...be16(0), ...commands, 0x80]).buffer
+}
+
+/**
+ * Build a POL file with one shape and one (black) palette.
+ * Vertex offsets are relative to the vertex data table.
+ */
+function buildPOL(shapeData: number[], vertexOffsets: number[], vertexData: number[]): ArrayBuffer {
+  const shapeOffsetTable = 0x14
+  const paletteOffset = shapeOffsetTable + 2
+  const verticesOffsetTable = paletteOffset + 32
+  const shapeDataTable = verticesOffsetTable + vertexOffsets.length * 2
+  const verticesDataTable = shapeDataTable + shapeData.length
+
+  return new Uint8Array([
+    0, 0, ...be16(shapeOffsetTable),
+    0, 0, ...be16(paletteOffset),
+    0, 0, ...be16(verticesOffsetTable),
+    0, 0, ...be16(shapeDataTable),
+    0, 0, ...be16(verticesDataTable),
+    ...be16(0),                           // shape 0 at start of shape data
+    ...new Array<number>(32).fill(0),     // palette 0
+    ...vertexOffsets.flatMap(be16),
+    ...shapeData,
+    ...vertexData,
+  ]).buffer
+}
+
+describe('parsePOL', () => {
+  it('applies negative int8 polygon deltas', () => {
+    const pol = buildPOL(
+      [...be16(1), ...be16(0), 5],        // one primitive, vertex 0, color 5
+      [0],
+      [2, ...be16(10), ...be16(-20 & 0xFFFF), 0xFD, 0x05, 0x04, 0xFE]
+    )
+
+    const { shapes } = parsePOL(pol)
+
+    expect(shapes[0].primitives[0]).toStrictEqual({
+      type: 'polygon',
+      color: 5,
+      hasAlpha: false,
+      vertices: [[10, -20], [7, -15], [11, -17]],
+    })
+  })
+
+  it('includes offsetX/offsetY only for primitives with an offset', () => {
+    const pol = buildPOL(
+      [
+        ...be16(2),
+        ...be16(0x8000 | 0), ...be16(-4 & 0xFFFF), ...be16(6), 3,  // point, offset (-4, 6)
+        ...be16(0x4000 | 1), 7,                                    // ellipse, alpha, no offset
+      ],
+      [0, 5],
+      [
+        0, ...be16(1), ...be16(2),                                 // point (1, 2)
+        0x80, ...be16(3), ...be16(4), ...be16(5), ...be16(6),      // ellipse (3, 4) r (5, 6)
+      ]
+    )
+
+    const [point, ellipse] = parsePOL(pol).shapes[0].primitives
+
+    expect(point).toStrictEqual({
+      type: 'point',
+      color: 3,
+      hasAlpha: false,
+      offsetX: -4,
+      offsetY: 6,
+      x: 1,
+      y: 2,
+    })
+    expect(ellipse).toStrictEqual({
+      type: 'ellipse',
+      color: 7,
+      hasAlpha: true,
+      cx: 3,
+      cy: 4,
+      rx: 5,
+      ry: 6,
+    })
+    expect(ellipse).not.toHaveProperty('offsetX')
+  })
+})
+
+describe('parseCMD', () => {
+  it('splits frames at markCurPos opcodes 0 and 5', () => {
+    const MARK = 0 << 2, MARK_2 = 5 << 2, NOP = 7 << 2, REFRESH = 1 << 2
+    // Subscene 0 starts with markCurPos; subscene 1 does not
+    const sub0 = [MARK, NOP, MARK_2, REFRESH, 1, MARK, 0x80]
+    const sub1 = [NOP, MARK, NOP, 0x80]
+    const script = parseCMD(new Uint8Array([
+      ...be16(2), ...be16(0), ...be16(sub0.length),
+      ...sub0,
+      ...sub1,
+    ]).buffer)
+
+    const ops = script.subscenes.map(sub =>
+      sub.frames.map(frame => frame.commands.map(cmd => cmd.op))
+    )
+
+    expect(ops).toStrictEqual([
+      [['markCurPos', 'nop'], ['markCurPos', 'refreshScreen'], ['markCurPos']],
+      [['nop'], ['markCurPos', 'nop']],
+    ])
+  })
+
+  it('decodes negative drawTextAtPos coordinates', () => {
+    // stringId 5, color 2, x = -3 * 8, y = 4 * 8
+    const script = parseCMD(buildCMD([13 << 2, ...be16(0x2005), 0xFD, 0x04]))
+
+    expect(script.subscenes[0].frames[0].commands[0]).toStrictEqual({
+      op: 'drawTextAtPos',
+      stringId: 5,
+      color: 2,
+      x: -24,
+      y: 32,
+    })
+  })
+})
@@ -30,23 +30,24 @@ const enum Opcode {
   HANDLE_KEYS = 14,
 }
 
-const OPCODE_NAMES: Record<number, string> = {
-  [Opcode.MARK_CUR_POS]: 'markCurPos',
-  [Opcode.REFRESH_SCREEN]: 'refreshScreen',
-  [Opcode.WAIT_FOR_SYNC]: 'waitForSync',
-  [Opcode.DRAW_SHAPE]: 'drawShape',
-  [Opcode.SET_PALETTE]: 'setPalette',
-  [Opcode.MARK_CUR_POS_2]: 'markCurPos',
-  [Opcode.DRAW_CAPTION_TEXT]: 'drawCaptionText',
-  [Opcode.NOP]: 'nop',
-  [Opcode.SKIP_3]: 'skip3',
-  [Opcode.REFRESH_ALL]: 'refreshAll',
-  [Opcode.DRAW_SHAPE_SCALE]: 'drawShapeScale',
-  [Opcode.DRAW_SHAPE_SCALE_ROT]: 'drawShapeScaleRotate',
-  [Opcode.COPY_SCREEN]: 'copyScreen',
-  [Opcode.DRAW_TEXT_AT_POS]: 'drawTextAtPos',
-  [Opcode.HANDLE_KEYS]: 'handleKeys',
-}
+/** Command names indexed directly by opcode (0-14) */
+const OPCODE_NAMES: readonly string[] = [
+  'markCurPos',           // MARK_CUR_POS
+  'refreshScreen',        // REFRESH_SCREEN
+  'waitForSync',          // WAIT_FOR_SYNC
+  'drawShape',            // DRAW_SHAPE
+  'setPalette',           // SET_PALETTE
+  'markCurPos',           // MARK_CUR_POS_2
+  'drawCaptionText',      // DRAW_CAPTION_TEXT
+  'nop',                  // NOP
+  'skip3',                // SKIP_3
+  'refreshAll',           // REFRESH_ALL
+  'drawShapeScale',       // DRAW_SHAPE_SCALE
+  'drawShapeScaleRotate', // DRAW_SHAPE_SCALE_ROT
+  'copyScreen',           // COPY_SCREEN
+  'drawTextAtPos',        // DRAW_TEXT_AT_POS
+  'handleKeys',           // HANDLE_KEYS
+]
 
 /**
  * Binary reader helper class
@@ -54,11 +55,14 @@ const OPCODE_NAMES: Record<number, string> = {
 class BinaryReader {
   private view: DataView
   private data: Uint8Array
+  private signedData: Int8Array
   pos: number = 0
 
   constructor(buffer: ArrayBuffer) {
     this.view = new DataView(buffer)
     this.data = new Uint8Array(buffer)
+    // Signed view over the same bytes so int8 reads need no sign fix-up
+    this.signedData = new Int8Array(buffer)
   }
 
   get length(): number {
@@ -72,9 +76,9 @@ class BinaryReader {
   }
 
   readInt8(): number {
-    const value = this.data[this.pos]
+    const value = this.signedData[this.pos]
     this.pos += 1
-    return value < 128 ? value : value - 256
+    return value
   }
 
   readBEUint16(): number {
@@ -102,8 +106,7 @@ class BinaryReader {
   }
 
   readInt8At(offset: number): number {
-    const value = this.data[offset]
-    return value < 128 ? value : value - 256
+    return this.signedData[offset]
   }
 
   seek(offset: number): void {
@@ -146,29 +149,11 @@ export function parseCMD(buffer: ArrayBuffer): Script {
   
   for (let s = 0; s < actualSubCount; s++) {
     reader.seek(baseOffset + subOffsets[s])
-    const commands = parseCommands(reader)
-    
-    // Group commands into frames (separated by markCurPos)
-    const frames: Frame[] = []
-    let currentFrame: Command[] = []
-    
-    for (const cmd of commands) {
-      if (cmd.op === 'markCurPos' && currentFrame.length > 0) {
-        frames.push({ commands: currentFrame })
-        currentFrame = []
-      }
-      currentFrame.push(cmd)
-    }
-    
-    // Don't forget the last frame
-    if (currentFrame.length > 0) {
-      frames.push({ commands: currentFrame })
-    }
     
     subscenes.push({
       id: s,
       offset: subOffsets[s],
-      frames
+      frames: parseFrames(reader)
     })
   }
   
@@ -180,10 +165,12 @@ export function parseCMD(buffer: ArrayBuffer): Script {
 }
 
 /**
- * Parse commands from the current position until end marker
+ * Parse commands from the current position until end marker,
+ * grouped into frames (separated by markCurPos) as they are decoded
  */
-function parseCommands(reader: BinaryReader): Command[] {
-  const commands: Command[] = []
+function parseFrames(reader: BinaryReader): Frame[] {
+  const frames: Frame[] = []
+  let currentFrame: Command[] = []
   
   while (!reader.eof()) {
     const byte = reader.readUint8()
@@ -199,8 +186,13 @@ function parseCommands(reader: BinaryReader): Command[] {
       break
     }
     
-    const name = OPCODE_NAMES[opcode] ?? `unknown_${opcode}`
-    const cmd: Command = { op: name }
+    const cmd: Command = { op: OPCODE_NAMES[opcode] }
+    
+    // markCurPos starts a new frame
+    if ((opcode === Opcode.MARK_CUR_POS || opcode === Opcode.MARK_CUR_POS_2) && currentFrame.length > 0) {
+      frames.push({ commands: currentFrame })
+      currentFrame = []
+    }
     
     // Parse arguments based on opcode
     switch (opcode) {
@@ -322,10 +314,15 @@ function parseCommands(reader: BinaryReader): Command[] {
       // Opcodes with no arguments: MARK_CUR_POS, MARK_CUR_POS_2, NOP, REFRESH_ALL, COPY_SCREEN
     }
     
-    commands.push(cmd)
+    currentFrame.push(cmd)
+  }
+  
+  // Don't forget the last frame
+  if (currentFrame.length > 0) {
+    frames.push({ commands: currentFrame })
   }
   
-  return commands
+  return frames
 }
 
 /**
@@ -475,23 +472,18 @@ function parseVertices(
   const numVertices = reader.readUint8At(vertexOffset)
   let pos = vertexOffset + 1
   
-  const baseProps = {
-    color,
-    hasAlpha,
-    ...(offsetX !== 0 || offsetY !== 0 ? { offsetX, offsetY } : {})
-  }
-  
   if (numVertices === 0) {
     // Point primitive
     const x = reader.readBEInt16At(pos)
     const y = reader.readBEInt16At(pos + 2)
     
-    return {
+    return applyOffset<PointPrimitive>({
       type: 'point',
-      ...baseProps,
+      color,
+      hasAlpha,
       x,
       y
-    } as PointPrimitive
+    }, offsetX, offsetY)
   }
   
   if (numVertices & 0x80) {
@@ -501,14 +493,15 @@ function parseVertices(
     const rx = reader.readBEInt16At(pos + 4)
     const ry = reader.readBEInt16At(pos + 6)
     
-    return {
+    return applyOffset<EllipsePrimitive>({
       type: 'ellipse',
-      ...baseProps,
+      color,
+      hasAlpha,
       cx,
       cy,
       rx,
       ry
-    } as EllipsePrimitive
+    }, offsetX, offsetY)
   }
   
   // Polygon primitive
@@ -530,9 +523,21 @@ function parseVertices(
     vertices.push([ix, iy])
   }
   
-  return {
+  return applyOffset<PolygonPrimitive>({
     type: 'polygon',
-    ...baseProps,
+    color,
+    hasAlpha,
     vertices
-  } as PolygonPrimitive
+  }, offsetX, offsetY)
+}
+
+/**
+ * Attach the primitive offset, which is only present when non-zero
+ */
+function applyOffset<T extends Primitive>(primitive: T, offsetX: number, offsetY: number): T {
+  if (offsetX !== 0 || offsetY !== 0) {
+    primitive.offsetX = offsetX
+    primitive.offsetY = offsetY
+  }
+  return primitive
 }
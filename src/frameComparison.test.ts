@@ -68,11 +68,16 @@ function compareImageData(
   let differentPixels = 0
   let maxPixelDiff = 0
   let cumulativeDiff = 0
-  
-  for (let i = 0; i < rendered.data.length; i += 4) {
-    const rDiff = Math.abs(rendered.data[i] - reference.data[i])
-    const gDiff = Math.abs(rendered.data[i + 1] - reference.data[i + 1])
-    const bDiff = Math.abs(rendered.data[i + 2] - reference.data[i + 2])
+
+  // Read .data once outside the loop instead of on every iteration
+  const renderedData = rendered.data
+  const referenceData = reference.data
+  const length = renderedData.length
+
+  for (let i = 0; i < length; i += 4) {
+    const rDiff = Math.abs(renderedData[i] - referenceData[i])
+    const gDiff = Math.abs(renderedData[i + 1] - referenceData[i + 1])
+    const bDiff = Math.abs(renderedData[i + 2] - referenceData[i + 2])
     // Alpha channel (i + 3) typically ignored for comparison
     
     const pixelMaxDiff = Math.max(rDiff, gDiff, bDiff)